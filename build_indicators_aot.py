@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Ahead-of-time compile the technical indicator kernels
+Builds src/fast_indicators_aot so the analyzer doesn't pay Numba's JIT
+warmup on every run. Without it src/fast_indicators is JIT-compiled instead
+"""
+
+import hashlib
+import os
+import sys
+
+from numba.pycc import CC
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(ROOT)
+from src.fast_indicators import compute_all, macd_fused
+
+cc = CC("fast_indicators_aot")
+cc.output_dir = os.path.join(ROOT, "src")
+
+# The analyzer only loads the build if this digest matches the current
+# kernel source, so an old build can't shadow later kernel changes
+SOURCE_PATH = os.path.join(cc.output_dir, "fast_indicators.py")
+DIGEST_PATH = os.path.join(cc.output_dir, "fast_indicators_aot.sha256")
+
+# The analyzer computes indicators on 1-D float32 arrays
+cc.export("compute_all", "UniTuple(f4[:], 5)(f4[:], f4[:])")(compute_all.py_func)
+cc.export(
+    "macd_fused", "void(f4[:], f8, f8, f8, f4[:], f4[:], f4[:], f4[:], f4[:])"
+)(macd_fused.py_func)
+
+
+if __name__ == "__main__":
+    cc.compile()
+    with open(SOURCE_PATH, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    with open(DIGEST_PATH, "w") as f:
+        f.write(digest)
+    print(f"Compiled indicator kernels into {cc.output_dir}")
@@ -97,6 +97,7 @@ PERFORMANCE_CONFIG = {
     "max_workers": 4,  # Number of parallel workers
     "cache_enabled": True,
     "cache_duration": 3600,  # Cache duration in seconds
+    "cache_dir": "~/.cache/crypto-analyzer",  # Parquet cache for price data
     "request_timeout": 30,  # Request timeout in seconds
 }
 
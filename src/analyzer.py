@@ -5,65 +5,142 @@ Performs technical analysis on cryptocurrency data
 
 import pandas as pd
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+import hashlib
+import importlib.util
 import logging
+import orjson
 import os
 import sys
+import threading
 
 # Add parent directory to path to import scraper
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.scraper import CryptoScraper
+from src.online_indicators import OnlineIndicators
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _load_kernels():
+    """
+    Indicator kernels: the ones precompiled by build_indicators_aot.py if
+    they were built from the current src/fast_indicators.py, otherwise the
+    JIT-compiled ones
+    """
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    try:
+        with open(os.path.join(src_dir, "fast_indicators.py"), "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        with open(os.path.join(src_dir, "fast_indicators_aot.sha256")) as f:
+            current = f.read().strip() == digest
+    except OSError:
+        current = False
+
+    try:
+        if current:
+            from src.fast_indicators_aot import compute_all, macd_fused
+
+            return compute_all, macd_fused
+        if importlib.util.find_spec("src.fast_indicators_aot") is not None:
+            logger.warning(
+                "Precompiled indicator kernels are out of date with "
+                "src/fast_indicators.py, using the JIT kernels instead; "
+                "rerun build_indicators_aot.py"
+            )
+    except ImportError:
+        pass
+
+    from src.fast_indicators import compute_all, macd_fused
+
+    return compute_all, macd_fused
+
+
+compute_all, macd_fused = _load_kernels()
+
+
+def _signal(buy, sell):
+    """
+    Combine buy/sell masks into an int8 signal (1: Buy, -1: Sell, 0: Hold)
+    """
+    return buy.astype(np.int8) - sell.astype(np.int8)
+
+
 class CryptoAnalyzer:
     def __init__(self):
         self.scraper = CryptoScraper()
         self.analysis_results = {}
+        self._results_lock = threading.Lock()
+        self.live_indicators = {}
 
     def calculate_technical_indicators(self, data):
         """
-        Calculate various technical indicators for the given data
+        Calculate various technical indicators for the given data.
+        Returns a new DataFrame that shares the input's price columns
         """
         if data is None or data.empty:
             return None
 
-        df = data.copy()
-
-        # Moving Averages
-        df["SMA_20"] = df["Close"].rolling(window=20).mean()
-        df["SMA_50"] = df["Close"].rolling(window=50).mean()
-        df["EMA_12"] = df["Close"].ewm(span=12).mean()
-        df["EMA_26"] = df["Close"].ewm(span=26).mean()
-
-        # MACD
-        df["MACD"] = df["EMA_12"] - df["EMA_26"]
-        df["MACD_Signal"] = df["MACD"].ewm(span=9).mean()
-        df["MACD_Histogram"] = df["MACD"] - df["MACD_Signal"]
-
-        # RSI
-        delta = df["Close"].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df["RSI"] = 100 - (100 / (1 + rs))
-
-        # Bollinger Bands
-        df["BB_Middle"] = df["Close"].rolling(window=20).mean()
-        bb_std = df["Close"].rolling(window=20).std()
-        df["BB_Upper"] = df["BB_Middle"] + (bb_std * 2)
-        df["BB_Lower"] = df["BB_Middle"] - (bb_std * 2)
-
-        # Volume indicators
-        df["Volume_SMA"] = df["Volume"].rolling(window=20).mean()
-        df["Volume_Ratio"] = df["Volume"] / df["Volume_SMA"]
+        # Indicators are computed in float32: ample precision for prices and
+        # half the memory traffic of float64 (risk metrics stay float64)
+        close = data["Close"].to_numpy(dtype=np.float32)
+        volume = data["Volume"].to_numpy(dtype=np.float32)
+        sma_20, sma_50, rsi, bb_std, volume_sma = compute_all(close, volume)
+
+        n = close.size
+        ema_12, ema_26, macd, macd_signal, macd_histogram = (
+            np.empty(n, dtype=np.float32) for _ in range(5)
+        )
+        macd_fused(
+            close,
+            2 / (12 + 1),
+            2 / (26 + 1),
+            2 / (9 + 1),
+            ema_12,
+            ema_26,
+            macd,
+            macd_signal,
+            macd_histogram,
+        )
+
+        close_64 = data["Close"].to_numpy(dtype=np.float64)
+        daily_return = np.empty(n)
+        daily_return[0] = np.nan
+        daily_return[1:] = np.diff(close_64) / close_64[:-1]
+
+        results = {
+            # Moving Averages
+            "SMA_20": sma_20,
+            "SMA_50": sma_50,
+            "EMA_12": ema_12,
+            "EMA_26": ema_26,
+            # MACD
+            "MACD": macd,
+            "MACD_Signal": macd_signal,
+            "MACD_Histogram": macd_histogram,
+            # RSI (Wilder's smoothing)
+            "RSI": rsi,
+            # Bollinger Bands
+            "BB_Middle": sma_20,
+            "BB_Upper": sma_20 + (bb_std * 2),
+            "BB_Lower": sma_20 - (bb_std * 2),
+            # Volume indicators
+            "Volume_SMA": volume_sma,
+            "Volume_Ratio": volume / volume_sma,
+            # Price changes (the cumulative product of 1 + daily return
+            # telescopes to close / first close)
+            "Daily_Return": daily_return,
+            "Cumulative_Return": close_64 / close_64[0],
+        }
 
-        # Price changes
-        df["Daily_Return"] = df["Close"].pct_change()
-        df["Cumulative_Return"] = (1 + df["Daily_Return"]).cumprod()
+        # Shallow copy: the OHLCV columns share their buffers with `data`,
+        # which is left unmodified as only new columns are added
+        df = data.copy(deep=False)
+        for column, values in results.items():
+            df[column] = values
 
         return df
 
@@ -74,37 +151,55 @@ class CryptoAnalyzer:
         if data is None or data.empty:
             return None
 
-        df = data.copy()
-        signals = pd.DataFrame(index=df.index)
-        signals["Signal"] = 0  # 0: Hold, 1: Buy, -1: Sell
+        close = data["Close"].to_numpy()
+        macd = data["MACD"].to_numpy()
+        macd_line = data["MACD_Signal"].to_numpy()
+        rsi = data["RSI"].to_numpy()
+        sma_20 = data["SMA_20"].to_numpy()
+        sma_50 = data["SMA_50"].to_numpy()
 
         # MACD Signal
-        signals.loc[df["MACD"] > df["MACD_Signal"], "MACD_Signal"] = 1
-        signals.loc[df["MACD"] < df["MACD_Signal"], "MACD_Signal"] = -1
+        macd_signal = _signal(macd > macd_line, macd < macd_line)
 
         # RSI Signal
-        signals.loc[df["RSI"] < 30, "RSI_Signal"] = 1  # Oversold
-        signals.loc[df["RSI"] > 70, "RSI_Signal"] = -1  # Overbought
+        rsi_signal = _signal(rsi < 30, rsi > 70)  # Oversold / Overbought
 
         # Moving Average Signal
-        signals.loc[df["SMA_20"] > df["SMA_50"], "MA_Signal"] = 1
-        signals.loc[df["SMA_20"] < df["SMA_50"], "MA_Signal"] = -1
+        ma_signal = _signal(sma_20 > sma_50, sma_20 < sma_50)
 
         # Bollinger Bands Signal
-        signals.loc[df["Close"] < df["BB_Lower"], "BB_Signal"] = 1  # Oversold
-        signals.loc[df["Close"] > df["BB_Upper"], "BB_Signal"] = -1  # Overbought
-
-        # Combined signal (simple average)
-        signal_columns = ["MACD_Signal", "RSI_Signal", "MA_Signal", "BB_Signal"]
-        available_signals = [col for col in signal_columns if col in signals.columns]
-
-        if available_signals:
-            signals["Combined_Signal"] = signals[available_signals].mean(axis=1)
-            signals["Final_Signal"] = np.where(
-                signals["Combined_Signal"] > 0.5,
-                1,
-                np.where(signals["Combined_Signal"] < -0.5, -1, 0),
-            )
+        bb_signal = _signal(
+            close < data["BB_Lower"].to_numpy(),  # Oversold
+            close > data["BB_Upper"].to_numpy(),  # Overbought
+        )
+
+        # Combined signal: average of the indicators that fired, so a
+        # majority (|total| > active / 2) is needed for a final signal
+        total = macd_signal + rsi_signal + ma_signal + bb_signal
+        active = (
+            (macd_signal != 0).astype(np.int8)
+            + (rsi_signal != 0)
+            + (ma_signal != 0)
+            + (bb_signal != 0)
+        )
+        combined = np.full(total.size, np.nan)
+        np.divide(total, active, out=combined, where=active > 0)
+        final = np.sign(total) * (2 * np.abs(total) > active)
+
+        # 0: Hold, 1: Buy, -1: Sell
+        signals = pd.DataFrame(
+            {
+                "Signal": np.zeros(total.size, dtype=np.int8),
+                "MACD_Signal": macd_signal,
+                "RSI_Signal": rsi_signal,
+                "MA_Signal": ma_signal,
+                "BB_Signal": bb_signal,
+                "Combined_Signal": combined,
+                "Final_Signal": final.astype(np.int8),
+            },
+            index=data.index,
+            copy=False,
+        )
 
         return signals
 
@@ -115,17 +210,28 @@ class CryptoAnalyzer:
         if data is None or data.empty:
             return None
 
-        returns = data["Close"].pct_change().dropna()
+        close = data["Close"].to_numpy(dtype=np.float64)
+        returns = np.diff(close) / close[:-1]
+        returns = returns[~np.isnan(returns)]
+
+        mean = returns.mean()
+        volatility = np.sqrt(returns.var(ddof=1) * 252)  # Annualized volatility
+
+        # 5th percentile (linear interpolation, as np.percentile) via a
+        # partial sort; the tail up to `lower` is at or below VaR
+        position = 0.05 * (returns.size - 1)
+        lower = int(position)
+        upper = min(lower + 1, returns.size - 1)
+        tail = np.partition(returns, [lower, upper])
+        var_95 = tail[lower] + (position - lower) * (tail[upper] - tail[lower])
 
         metrics = {
-            "Volatility": returns.std() * np.sqrt(252),  # Annualized volatility
-            "Sharpe_Ratio": (returns.mean() * 252) / (returns.std() * np.sqrt(252)),
+            "Volatility": volatility,
+            "Sharpe_Ratio": (mean * 252) / volatility,
             "Max_Drawdown": self.calculate_max_drawdown(data["Close"]),
-            "VaR_95": np.percentile(returns, 5),  # 95% Value at Risk
-            "CVaR_95": returns[
-                returns <= np.percentile(returns, 5)
-            ].mean(),  # Conditional VaR
-            "Total_Return": (data["Close"].iloc[-1] / data["Close"].iloc[0]) - 1,
+            "VaR_95": var_95,  # 95% Value at Risk
+            "CVaR_95": tail[: lower + 1].mean(),  # Conditional VaR
+            "Total_Return": (close[-1] / close[0]) - 1,
         }
 
         return metrics
@@ -134,18 +240,21 @@ class CryptoAnalyzer:
         """
         Calculate maximum drawdown
         """
-        peak = prices.expanding(min_periods=1).max()
-        drawdown = (prices - peak) / peak
-        return drawdown.min()
+        # fmax/nanmin skip missing prices, like expanding().max() and min()
+        prices = prices.to_numpy(dtype=np.float64)
+        peak = np.fmax.accumulate(prices)
+        return float(np.nanmin((prices - peak) / peak))
 
-    def analyze_cryptocurrency(self, symbol, period="6mo"):
+    def analyze_cryptocurrency(self, symbol, period="6mo", data=None):
         """
-        Complete analysis of a cryptocurrency
+        Complete analysis of a cryptocurrency.
+        Pass already fetched price data to skip the download
         """
         logger.info(f"Starting analysis for {symbol}")
 
         # Fetch data
-        data = self.scraper.get_crypto_data_yahoo(symbol, period)
+        if data is None:
+            data = self.scraper.get_crypto_data_yahoo(symbol, period)
         if data is None or data.empty:
             logger.error(f"Could not fetch data for {symbol}")
             return None
@@ -169,43 +278,91 @@ class CryptoAnalyzer:
             "analysis_date": datetime.now(),
         }
 
-        self.analysis_results[symbol] = analysis_result
+        with self._results_lock:
+            self.analysis_results[symbol] = analysis_result
         logger.info(f"Analysis completed for {symbol}")
 
         return analysis_result
 
-    def save_analysis(self, symbol, output_dir="../output"):
+    def update_live(self, symbol, new_close, new_volume):
+        """
+        Update the indicators of a symbol with a new bar in O(1) and
+        return the latest values. On first use the state is warmed up
+        from the symbol's analyzed history, if there is one
         """
-        Save analysis results to files
+        state = self.live_indicators.get(symbol)
+        if state is None:
+            state = OnlineIndicators()
+            history = self.analysis_results.get(symbol)
+            if history is not None:
+                data = history["data"]
+                for close, volume in zip(
+                    data["Close"].to_numpy(dtype=np.float64),
+                    data["Volume"].to_numpy(dtype=np.float64),
+                ):
+                    state.update(close, volume)
+            self.live_indicators[symbol] = state
+
+        return state.update(float(new_close), float(new_volume))
+
+    def save_analysis(self, symbol, output_dir="../output", data_format="parquet"):
+        """
+        Save analysis results to files.
+        data_format "parquet" writes Parquet data and JSON metrics,
+        "csv" writes CSV data and a plain-text metrics report
         """
         if symbol not in self.analysis_results:
             logger.error(f"No analysis results found for {symbol}")
             return None
 
         result = self.analysis_results[symbol]
+        prefix = os.path.join(output_dir, symbol.lower())
+
+        def save_frame(frame, path):
+            if data_format == "parquet":
+                frame.to_parquet(
+                    f"{path}.parquet", compression="zstd", engine="pyarrow"
+                )
+            else:
+                frame.to_csv(f"{path}.csv")
 
         try:
             os.makedirs(output_dir, exist_ok=True)
 
             # Save data with indicators
-            data_file = os.path.join(output_dir, f"{symbol.lower()}_analysis.csv")
-            result["data"].to_csv(data_file)
+            save_frame(result["data"], f"{prefix}_analysis")
 
             # Save signals
             if result["signals"] is not None:
-                signals_file = os.path.join(output_dir, f"{symbol.lower()}_signals.csv")
-                result["signals"].to_csv(signals_file)
+                save_frame(result["signals"], f"{prefix}_signals")
 
             # Save risk metrics
-            if result["risk_metrics"] is not None:
-                metrics_file = os.path.join(output_dir, f"{symbol.lower()}_metrics.txt")
-                with open(metrics_file, "w") as f:
-                    f.write(f"Analysis for {symbol}\n")
-                    f.write(f"Date: {result['analysis_date']}\n")
-                    f.write(f"Last Price: ${result['last_price']:.2f}\n\n")
-                    f.write("Risk Metrics:\n")
-                    for metric, value in result["risk_metrics"].items():
-                        f.write(f"{metric}: {value:.4f}\n")
+            if result["risk_metrics"] is not None and data_format == "parquet":
+                with open(f"{prefix}_metrics.json", "wb") as f:
+                    f.write(
+                        orjson.dumps(
+                            {
+                                "symbol": symbol,
+                                "analysis_date": result["analysis_date"],
+                                "last_price": result["last_price"],
+                                "risk_metrics": result["risk_metrics"],
+                            },
+                            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY,
+                        )
+                    )
+            elif result["risk_metrics"] is not None:
+                lines = [
+                    f"Analysis for {symbol}",
+                    f"Date: {result['analysis_date']}",
+                    f"Last Price: ${result['last_price']:.2f}",
+                    "",
+                    "Risk Metrics:",
+                ] + [
+                    f"{metric}: {value:.4f}"
+                    for metric, value in result["risk_metrics"].items()
+                ]
+                with open(f"{prefix}_metrics.txt", "w") as f:
+                    f.write("\n".join(lines) + "\n")
 
             logger.info(f"Analysis saved for {symbol}")
             return True
@@ -225,11 +382,28 @@ def main():
     top_cryptos = analyzer.scraper.get_top_cryptocurrencies(5)
     logger.info(f"Analyzing top cryptocurrencies: {top_cryptos}")
 
-    # Analyze each cryptocurrency
+    # Fetch price data for all cryptocurrencies concurrently, then retry
+    # whatever failed with one batched yfinance download
+    price_data = analyzer.scraper.get_crypto_data_many(top_cryptos, period="6mo")
+    failed = [crypto for crypto in top_cryptos if price_data.get(crypto) is None]
+    if failed:
+        price_data.update(analyzer.scraper.get_crypto_data_batch(failed, period="6mo"))
+
+    # Analyze the cryptocurrencies concurrently (anything still missing is
+    # fetched per symbol)
+    max_workers = min(len(top_cryptos), (os.cpu_count() or 1) * 5) or 1
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                analyzer.analyze_cryptocurrency, crypto, data=price_data.get(crypto)
+            )
+            for crypto in top_cryptos
+        ]
+
     successful_analyses = 0
-    for crypto in top_cryptos:
+    for crypto, future in zip(top_cryptos, futures):
         try:
-            result = analyzer.analyze_cryptocurrency(crypto)
+            result = future.result()
             if result:
                 analyzer.save_analysis(crypto)
                 successful_analyses += 1
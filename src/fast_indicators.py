@@ -0,0 +1,165 @@
+"""
+Fast Technical Indicators
+Numba-compiled kernels for the technical indicator calculations
+"""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def compute_all(close, volume):
+    """
+    Calculate SMA 20/50, RSI 14, the 20 day rolling standard deviation
+    and the 20 day volume SMA in a single pass over the data.
+    Outputs have the dtype of the inputs; accumulators are kept in float64.
+    Like pandas rolling(), a window containing a missing (non-finite) value
+    gives NaN; RSI skips missing closes
+    """
+    n = close.size
+
+    sma_20 = np.empty(n, dtype=close.dtype)
+    sma_50 = np.empty(n, dtype=close.dtype)
+    rsi = np.empty(n, dtype=close.dtype)
+    bb_std = np.empty(n, dtype=close.dtype)
+    volume_sma = np.empty(n, dtype=volume.dtype)
+
+    sum_50 = volume_sum = 0.0
+    mean_20 = m2_20 = 0.0
+    # Values in each window and missing values among them
+    count_20 = missing_20 = missing_50 = missing_volume = 0
+    previous = np.nan
+    changes = 0
+    gain_sum = loss_sum = 0.0
+    avg_gain = avg_loss = 0.0
+
+    for i in range(n):
+        price = np.float64(close[i])
+        valid = np.isfinite(price)
+
+        # 20 day mean and standard deviation (Welford over a sliding window);
+        # the mean doubles as SMA 20 and the Bollinger middle band
+        if i >= 20:
+            old = np.float64(close[i - 20])
+            if np.isfinite(old):
+                count_20 -= 1
+                if count_20 == 0:
+                    mean_20 = m2_20 = 0.0
+                else:
+                    delta = old - mean_20
+                    mean_20 -= delta / count_20
+                    m2_20 -= delta * (old - mean_20)
+            else:
+                missing_20 -= 1
+        if valid:
+            count_20 += 1
+            delta = price - mean_20
+            mean_20 += delta / count_20
+            m2_20 += delta * (price - mean_20)
+        else:
+            missing_20 += 1
+        if i >= 19 and missing_20 == 0:
+            sma_20[i] = mean_20
+            bb_std[i] = np.sqrt(max(m2_20, 0.0) / 19)
+        else:
+            sma_20[i] = bb_std[i] = np.nan
+
+        # Other simple moving averages (running sums)
+        if valid:
+            sum_50 += price
+        else:
+            missing_50 += 1
+        if i >= 50:
+            old = np.float64(close[i - 50])
+            if np.isfinite(old):
+                sum_50 -= old
+            else:
+                missing_50 -= 1
+        sma_50[i] = sum_50 / 50 if i >= 49 and missing_50 == 0 else np.nan
+
+        amount = np.float64(volume[i])
+        if np.isfinite(amount):
+            volume_sum += amount
+        else:
+            missing_volume += 1
+        if i >= 20:
+            old = np.float64(volume[i - 20])
+            if np.isfinite(old):
+                volume_sum -= old
+            else:
+                missing_volume -= 1
+        volume_sma[i] = volume_sum / 20 if i >= 19 and missing_volume == 0 else np.nan
+
+        # RSI (Wilder's smoothing, seeded with the first 14 change average);
+        # changes run from one available close to the next
+        rsi[i] = np.nan
+        if not valid:
+            continue
+        if np.isnan(previous):
+            previous = price
+            continue
+        change = price - previous
+        previous = price
+        gain = max(change, 0.0)
+        loss = max(-change, 0.0)
+        changes += 1
+        if changes < 14:
+            gain_sum += gain
+            loss_sum += loss
+            continue
+        if changes == 14:
+            avg_gain = (gain_sum + gain) / 14
+            avg_loss = (loss_sum + loss) / 14
+        else:
+            avg_gain = (avg_gain * 13 + gain) / 14
+            avg_loss = (avg_loss * 13 + loss) / 14
+        # Neutral 50 when prices haven't moved at all (e.g. a pegged stablecoin)
+        total = avg_gain + avg_loss
+        rsi[i] = 100.0 * avg_gain / total if total > 0.0 else 50.0
+
+    return sma_20, sma_50, rsi, bb_std, volume_sma
+
+
+@njit(cache=True)
+def macd_fused(close, a12, a26, a9, out_ema12, out_ema26, out_macd, out_sig, out_hist):
+    """
+    Calculate EMA 12/26, MACD, the MACD signal line and the histogram in
+    one pass, writing into the preallocated output arrays.
+    EMAs use the same adjusted weighting as pandas ewm(span=...).mean();
+    missing closes add no weight but still decay the earlier ones
+    """
+    b12 = 1.0 - a12
+    b26 = 1.0 - a26
+    b9 = 1.0 - a9
+    num_12 = den_12 = num_26 = den_26 = num_9 = den_9 = 0.0
+
+    for i in range(close.size):
+        price = np.float64(close[i])
+        num_12 *= b12
+        den_12 *= b12
+        num_26 *= b26
+        den_26 *= b26
+        if np.isfinite(price):
+            num_12 += price
+            den_12 += 1.0
+            num_26 += price
+            den_26 += 1.0
+
+        # Nothing to average before the first available close
+        if den_12 == 0.0:
+            out_ema12[i] = out_ema26[i] = np.nan
+            out_macd[i] = out_sig[i] = out_hist[i] = np.nan
+            continue
+
+        ema_12 = num_12 / den_12
+        ema_26 = num_26 / den_26
+        macd = ema_12 - ema_26
+        num_9 = macd + b9 * num_9
+        den_9 = 1.0 + b9 * den_9
+        signal = num_9 / den_9
+
+        out_ema12[i] = ema_12
+        out_ema26[i] = ema_26
+        out_macd[i] = macd
+        out_sig[i] = signal
+        out_hist[i] = macd - signal
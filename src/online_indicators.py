@@ -0,0 +1,195 @@
+"""
+Online Technical Indicators
+Streaming indicator state that is updated in O(1) per new price
+"""
+
+import math
+
+import numpy as np
+
+
+class OnlineSMA:
+    """
+    Simple moving average over the last `window` values; NaN while the
+    window holds a missing value, like pandas rolling()
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.buffer = np.empty(window)
+        self.count = 0
+        self.missing = 0
+        self.total = 0.0
+
+    def update(self, x):
+        index = self.count % self.window
+        if self.count >= self.window:
+            old = self.buffer[index]
+            if math.isfinite(old):
+                self.total -= old
+            else:
+                self.missing -= 1
+        self.buffer[index] = x
+        if math.isfinite(x):
+            self.total += x
+        else:
+            self.missing += 1
+        self.count += 1
+
+        if self.count < self.window or self.missing:
+            return np.nan
+        return self.total / self.window
+
+
+class OnlineEMA:
+    """
+    Exponential moving average with the same adjusted weighting as
+    pandas ewm(span=...).mean(); missing values add no weight but still
+    decay the earlier ones
+    """
+
+    def __init__(self, span):
+        self.beta = 1.0 - 2.0 / (span + 1)
+        self.numerator = 0.0
+        self.denominator = 0.0
+
+    def update(self, x):
+        self.numerator *= self.beta
+        self.denominator *= self.beta
+        if math.isfinite(x):
+            self.numerator += x
+            self.denominator += 1.0
+
+        if not self.denominator:
+            return np.nan
+        return self.numerator / self.denominator
+
+
+class OnlineStd:
+    """
+    Sample standard deviation over the last `window` values (Welford);
+    NaN while the window holds a missing value, like pandas rolling()
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.buffer = np.empty(window)
+        self.count = 0
+        self.valid = 0
+        self.missing = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, x):
+        index = self.count % self.window
+        if self.count >= self.window:
+            old = self.buffer[index]
+            if math.isfinite(old):
+                self.valid -= 1
+                if self.valid == 0:
+                    self.mean = self.m2 = 0.0
+                else:
+                    delta = old - self.mean
+                    self.mean -= delta / self.valid
+                    self.m2 -= delta * (old - self.mean)
+            else:
+                self.missing -= 1
+        if math.isfinite(x):
+            self.valid += 1
+            delta = x - self.mean
+            self.mean += delta / self.valid
+            self.m2 += delta * (x - self.mean)
+        else:
+            self.missing += 1
+        self.buffer[index] = x
+        self.count += 1
+
+        if self.count < self.window or self.missing:
+            return np.nan
+        return math.sqrt(max(self.m2, 0.0) / (self.window - 1))
+
+
+class OnlineRSI:
+    """
+    Relative Strength Index with Wilder's smoothing, seeded with the
+    average of the first `period` changes; missing values are skipped
+    """
+
+    def __init__(self, period=14):
+        self.period = period
+        self.previous = None
+        self.count = 0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+
+    def update(self, x):
+        if not math.isfinite(x):
+            return np.nan
+
+        previous, self.previous = self.previous, x
+        if previous is None:
+            return np.nan
+
+        change = x - previous
+        gain = max(change, 0.0)
+        loss = max(-change, 0.0)
+        self.count += 1
+
+        if self.count <= self.period:
+            self.avg_gain += gain / self.period
+            self.avg_loss += loss / self.period
+            if self.count < self.period:
+                return np.nan
+        else:
+            self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+            self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+
+        # Neutral 50 when prices haven't moved at all (e.g. a pegged stablecoin)
+        total = self.avg_gain + self.avg_loss
+        return 100.0 * self.avg_gain / total if total > 0.0 else 50.0
+
+
+class OnlineIndicators:
+    """
+    The analyzer's indicator set for one symbol, updated one bar at a time
+    """
+
+    def __init__(self):
+        self.sma_20 = OnlineSMA(20)
+        self.sma_50 = OnlineSMA(50)
+        self.ema_12 = OnlineEMA(12)
+        self.ema_26 = OnlineEMA(26)
+        self.macd_signal = OnlineEMA(9)
+        self.rsi = OnlineRSI(14)
+        self.bb_std = OnlineStd(20)
+        self.volume_sma = OnlineSMA(20)
+
+    def update(self, close, volume):
+        """
+        Add a new bar and return the latest indicator values
+        """
+        sma_20 = self.sma_20.update(close)
+        bb_std = self.bb_std.update(close)
+        ema_12 = self.ema_12.update(close)
+        ema_26 = self.ema_26.update(close)
+        macd = ema_12 - ema_26
+        macd_signal = self.macd_signal.update(macd)
+        volume_sma = self.volume_sma.update(volume)
+
+        return {
+            "Close": close,
+            "Volume": volume,
+            "SMA_20": sma_20,
+            "SMA_50": self.sma_50.update(close),
+            "EMA_12": ema_12,
+            "EMA_26": ema_26,
+            "MACD": macd,
+            "MACD_Signal": macd_signal,
+            "MACD_Histogram": macd - macd_signal,
+            "RSI": self.rsi.update(close),
+            "BB_Middle": sma_20,
+            "BB_Upper": sma_20 + bb_std * 2,
+            "BB_Lower": sma_20 - bb_std * 2,
+            "Volume_SMA": volume_sma,
+            "Volume_Ratio": volume / volume_sma if volume_sma else np.nan,
+        }
@@ -3,11 +3,22 @@ Cryptocurrency Data Scraper
 Fetches cryptocurrency data from various sources
 """
 
+import aiohttp
+import asyncio
+import numpy as np
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
 import yfinance as yf
 import ccxt
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+import functools
+import hashlib
+import os
+import threading
 import time
 import logging
 
@@ -15,22 +26,145 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+DEFAULT_CACHE_DIR = os.path.join("~", ".cache", "crypto-analyzer")
+YAHOO_CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{symbol}-USD"
+
+# Top cryptocurrencies by limit -> (fetch time, symbols), shared per process
+_top_cryptos_cache = {}
+_top_cryptos_lock = threading.Lock()
+
+
+def disk_cached(method):
+    """
+    Cache the result of a (symbol, period) fetch on disk as Parquet
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, symbol, period="1y"):
+        data = self._load_cached(symbol, period)
+        if data is not None:
+            return data
+
+        data = method(self, symbol, period)
+        self._store_cached(symbol, period, data)
+        return data
+
+    return wrapper
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket allowing `rate` calls per `per` seconds
+    """
+
+    def __init__(self, rate, per=60.0):
+        self.capacity = rate
+        self.tokens = float(rate)
+        self.fill_rate = rate / per
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Block until a token is available and consume it
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.fill_rate
+                )
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait = (1 - self.tokens) / self.fill_rate
+
+            time.sleep(wait)
+
 
 class CryptoScraper:
-    def __init__(self):
+    def __init__(
+        self,
+        cache_enabled=True,
+        cache_duration=3600,
+        cache_dir=None,
+        rate_limit=100,
+        max_workers=4,
+    ):
+        self.max_workers = max_workers
+        self.rate_limiter = RateLimiter(rate_limit)  # Yahoo requests per minute
+        self.cache_enabled = cache_enabled
+        self.cache_duration = cache_duration  # seconds
+        self.cache_dir = os.path.expanduser(cache_dir or DEFAULT_CACHE_DIR)
         self.session = requests.Session()
         self.session.headers.update(
             {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
             }
         )
+        # Keep-alive connection pool for CoinGecko requests
+        self.session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=20,
+                pool_maxsize=50,
+                max_retries=Retry(total=3, backoff_factor=0.3),
+            ),
+        )
+        self._ticker_cache = {}
+
+    def _cache_path(self, symbol, period):
+        key = hashlib.sha1(f"{symbol}:{period}".encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.parquet")
 
+    def _load_cached(self, symbol, period):
+        """
+        Return cached data for symbol/period if a fresh entry exists
+        """
+        if not self.cache_enabled:
+            return None
+
+        path = self._cache_path(symbol, period)
+        try:
+            if time.time() - os.path.getmtime(path) < self.cache_duration:
+                data = pd.read_parquet(path)
+                logger.info(f"Loaded cached data for {symbol}")
+                return data
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache entry for {symbol}: {e}")
+        return None
+
+    def _store_cached(self, symbol, period, data):
+        """
+        Write fetched data to the disk cache
+        """
+        if not self.cache_enabled or data is None:
+            return
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            data.to_parquet(self._cache_path(symbol, period), compression="zstd")
+        except Exception as e:
+            logger.warning(f"Could not cache data for {symbol}: {e}")
+
+    @disk_cached
     def get_crypto_data_yahoo(self, symbol, period="1y"):
         """
         Fetch cryptocurrency data from Yahoo Finance
         """
         try:
-            ticker = yf.Ticker(f"{symbol}-USD")
+            self.rate_limiter.acquire()
+            # yfinance manages its own session (recent releases reject plain
+            # requests sessions); reusing the Ticker keeps its cookie state
+            ticker = self._ticker_cache.get(symbol)
+            if ticker is None:
+                ticker = yf.Ticker(f"{symbol}-USD")
+                self._ticker_cache[symbol] = ticker
             data = ticker.history(period=period)
             
             if data.empty:
@@ -43,6 +177,136 @@ class CryptoScraper:
             logger.error(f"Error fetching data for {symbol}: {e}")
             return None
 
+    def get_crypto_data_batch(self, symbols, period="1y"):
+        """
+        Fetch Yahoo Finance data for several cryptocurrencies with a single
+        yfinance download. Returns a dict mapping each symbol to its
+        DataFrame (or None)
+        """
+        results = {symbol: self._load_cached(symbol, period) for symbol in symbols}
+        missing = [symbol for symbol, data in results.items() if data is None]
+        if not missing:
+            return results
+
+        tickers = [f"{symbol}-USD" for symbol in missing]
+        try:
+            self.rate_limiter.acquire()
+            raw = yf.download(
+                tickers, period=period, group_by="ticker", threads=True, progress=False
+            )
+        except Exception as e:
+            logger.error(f"Error fetching data for {missing}: {e}")
+            return results
+
+        if not isinstance(raw.columns, pd.MultiIndex):
+            raw = pd.concat({tickers[0]: raw}, axis=1)
+
+        available = set(raw.columns.get_level_values(0))
+        for symbol, ticker in zip(missing, tickers):
+            data = None
+            if ticker in available:
+                data = raw.xs(ticker, level=0, axis=1).dropna(how="all")
+
+            if data is None or data.empty:
+                logger.warning(f"No data found for {ticker}")
+                continue
+
+            self._store_cached(symbol, period, data)
+            results[symbol] = data
+
+        logger.info(f"Successfully fetched data for {len(missing)} symbols")
+        return results
+
+    def get_crypto_data_many(self, symbols, period="1y"):
+        """
+        Fetch Yahoo Finance data for several cryptocurrencies concurrently.
+        Returns a dict mapping each symbol to its DataFrame (or None).
+        From async code, await fetch_crypto_data_many instead
+        """
+        coroutine = self.fetch_crypto_data_many(symbols, period)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+
+        # Called from inside a running event loop (e.g. Jupyter), where
+        # asyncio.run isn't allowed: run the fetch on its own loop in a thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coroutine).result()
+
+    async def fetch_crypto_data_many(self, symbols, period="1y"):
+        """
+        Async version of get_crypto_data_many
+        """
+        results = {}
+        missing = []
+        for symbol in symbols:
+            results[symbol] = self._load_cached(symbol, period)
+            if results[symbol] is None:
+                missing.append(symbol)
+
+        if missing:
+            fetched = await self._fetch_all(missing, period)
+            for symbol, data in fetched.items():
+                self._store_cached(symbol, period, data)
+                results[symbol] = data
+
+        return results
+
+    async def _fetch_all(self, symbols, period):
+        connector = aiohttp.TCPConnector(limit=self.max_workers)
+        async with aiohttp.ClientSession(
+            connector=connector, headers=dict(self.session.headers)
+        ) as session:
+            frames = await asyncio.gather(
+                *(self._fetch_chart(session, symbol, period) for symbol in symbols)
+            )
+        return dict(zip(symbols, frames))
+
+    async def _fetch_chart(self, session, symbol, period):
+        """
+        Fetch one symbol from Yahoo's chart endpoint
+        """
+        try:
+            await asyncio.to_thread(self.rate_limiter.acquire)
+            async with session.get(
+                YAHOO_CHART_URL.format(symbol=symbol),
+                params={"range": period, "interval": "1d"},
+            ) as response:
+                response.raise_for_status()
+                payload = orjson.loads(await response.read())
+
+            data = self._parse_chart(payload)
+            if data.empty:
+                logger.warning(f"No data found for {symbol}-USD")
+                return None
+
+            logger.info(f"Successfully fetched data for {symbol}")
+            return data
+        except Exception as e:
+            logger.error(f"Error fetching data for {symbol}: {e}")
+            return None
+
+    @staticmethod
+    def _parse_chart(payload):
+        """
+        Convert a Yahoo chart API response into an OHLCV DataFrame
+        """
+        result = payload["chart"]["result"][0]
+        quote = result["indicators"]["quote"][0]
+        index = pd.to_datetime(
+            np.asarray(result.get("timestamp", []), dtype=np.int64), unit="s", utc=True
+        )
+
+        data = pd.DataFrame(
+            {
+                column.capitalize(): np.asarray(quote[column], dtype=np.float64)
+                for column in ["open", "high", "low", "close", "volume"]
+            },
+            index=index,
+        )
+        return data.dropna(subset=["Close"])
+
     def get_crypto_data_ccxt(
         self, symbol, exchange="binance", timeframe="1d", limit=100
     ):
@@ -67,8 +331,15 @@ class CryptoScraper:
 
     def get_top_cryptocurrencies(self, limit=10):
         """
-        Get list of top cryptocurrencies by market cap
+        Get list of top cryptocurrencies by market cap.
+        Results are cached in memory for cache_duration seconds
         """
+        if self.cache_enabled:
+            with _top_cryptos_lock:
+                fetched_at, symbols = _top_cryptos_cache.get(limit, (0.0, None))
+            if symbols is not None and time.time() - fetched_at < self.cache_duration:
+                return list(symbols)
+
         try:
             url = "https://api.coingecko.com/api/v3/coins/markets"
             params = {
@@ -82,8 +353,13 @@ class CryptoScraper:
             response = self.session.get(url, params=params)
             response.raise_for_status()
 
-            data = response.json()
-            return [coin["symbol"].upper() for coin in data]
+            data = orjson.loads(response.content)
+            upper = str.upper
+            symbols = [upper(coin["symbol"]) for coin in data]
+
+            with _top_cryptos_lock:
+                _top_cryptos_cache[limit] = (time.time(), symbols)
+            return list(symbols)
         except Exception as e:
             logger.error(f"Error fetching top cryptocurrencies: {e}")
             return ["BTC", "ETH", "BNB", "ADA", "SOL"]  # Fallback list
@@ -93,8 +369,6 @@ class CryptoScraper:
         Save data to CSV file
         """
         try:
-            import os
-
             os.makedirs(output_dir, exist_ok=True)
             filepath = os.path.join(output_dir, filename)
             data.to_csv(filepath)
@@ -121,7 +395,6 @@ def main():
         if data is not None:
             filename = f"{crypto.lower()}_data.csv"
             scraper.save_data(data, filename)
-        time.sleep(1)  # Rate limiting
 
 
 if __name__ == "__main__":
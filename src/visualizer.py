@@ -3,28 +3,83 @@ Cryptocurrency Data Visualizer
 Creates charts and visualizations for cryptocurrency analysis
 """
 
-import matplotlib.pyplot as plt
-import seaborn as sns
 import plotly.graph_objects as go
-import plotly.express as px
+import plotly.io as pio
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+import functools
 import os
 import logging
+import queue
+import threading
 from datetime import datetime
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Set style for matplotlib
-plt.style.use("seaborn-v0_8")
-sns.set_palette("husl")
+# Serialize figures with orjson (already a dependency), which encodes numpy
+# arrays natively instead of through Python lists
+pio.json.config.default_engine = "orjson"
+
+# Traces the resampler doesn't aggregate (bars, plain figures) are capped at
+# this many points; more than a chart is pixels wide
+MAX_POINTS = 4000
+
+# Bar colors indexed by a "down" mask: 0 -> green, 1 -> red
+UP_DOWN_COLORS = np.array(["green", "red"], dtype=object)
+
+
+def _downsample(index, values, n_out=MAX_POINTS):
+    """
+    Keep at most n_out points of a series, chosen with MinMaxLTTB so peaks
+    and troughs survive
+    """
+    if len(values) <= n_out:
+        return index, values
+    # plotly_resampler pulls in dash, so it's only imported when needed
+    from plotly_resampler.aggregation import MinMaxLTTB
+
+    keep = MinMaxLTTB().arg_downsample(values, n_out=n_out)
+    return index[keep], values[keep]
+
+
+def _volume_bars(index, open_, close, volume, n_out=MAX_POINTS):
+    """
+    Volume bars and their up/down colors, summing consecutive days into
+    blocks when there are more than n_out of them
+    """
+    if len(volume) > n_out:
+        starts = np.arange(0, len(volume), -(-len(volume) // n_out))
+        ends = np.append(starts[1:], len(volume)) - 1
+        index, volume = index[starts], np.add.reduceat(volume, starts)
+        open_, close = open_[starts], close[ends]
+    return index, volume, UP_DOWN_COLORS[(close < open_).astype(np.uint8)]
+
+
+@functools.lru_cache(maxsize=None)
+def _palette(name):
+    """
+    Qualitative plotly color sequence by name (e.g. "Set3")
+    """
+    # plotly.express is slow to import and only needed for its palettes
+    import plotly.express as px
+
+    return tuple(getattr(px.colors.qualitative, name))
 
 
 class CryptoVisualizer:
-    def __init__(self):
+    def __init__(self, use_webgl=True, mode="interactive"):
+        # WebGL line traces render long histories much faster; turn off for
+        # SVG output (e.g. static image export)
+        self.use_webgl = use_webgl
+        # "static" saves the heatmap, risk-return and comparison charts as
+        # PNG images (via kaleido); price charts always stay interactive
+        if mode not in ("interactive", "static"):
+            raise ValueError(f"Unknown visualizer mode: {mode}")
+        self.mode = mode
         self.colors = {
             "primary": "#1f77b4",
             "secondary": "#ff7f0e",
@@ -33,107 +88,142 @@ class CryptoVisualizer:
             "warning": "#ff7f0e",
             "info": "#17a2b8",
         }
+        self._line_styles = {name: dict(color=c) for name, c in self.colors.items()}
+
+    def _tile_path(self, save_path):
+        """
+        Path a summary chart is actually saved to: a PNG in static mode
+        """
+        if self.mode == "static":
+            return os.path.splitext(save_path)[0] + ".png"
+        return save_path
+
+    def _save_tile(self, fig, save_path):
+        """
+        Save a summary chart as HTML, or as a PNG in static mode.
+        Returns the path written
+        """
+        save_path = self._tile_path(save_path)
+        if self.mode == "static":
+            fig.write_image(save_path, width=1200, height=600)
+        else:
+            fig.write_html(
+                save_path, include_plotlyjs="cdn", full_html=True, validate=False
+            )
+        return save_path
+
+    def _scatter(self, **kwargs):
+        """
+        Create a line trace, WebGL-rendered unless use_webgl is off
+        """
+        trace = go.Scattergl if self.use_webgl else go.Scatter
+        return trace(**kwargs)
 
     def create_price_chart(self, data, symbol, save_path=None):
         """
-        Create a comprehensive price chart with technical indicators
+        Create a comprehensive price chart with technical indicators.
+        Returns a FigureResampler; call fig.show_dash() to explore it with
+        data re-aggregated on zoom
         """
         if data is None or data.empty:
             logger.error("No data provided for visualization")
             return None
 
-        # Create subplots
-        fig = make_subplots(
-            rows=4,
-            cols=1,
-            shared_xaxes=True,
-            vertical_spacing=0.05,
-            subplot_titles=(f"{symbol} Price Chart", "Volume", "RSI", "MACD"),
-            row_heights=[0.5, 0.15, 0.15, 0.2],
+        from plotly_resampler import FigureResampler
+
+        # Create subplots; the resampler only sends an aggregated view of each
+        # trace to the browser, so long histories stay responsive
+        fig = FigureResampler(
+            make_subplots(
+                rows=4,
+                cols=1,
+                shared_xaxes=True,
+                vertical_spacing=0.05,
+                subplot_titles=(f"{symbol} Price Chart", "Volume", "RSI", "MACD"),
+                row_heights=[0.5, 0.15, 0.15, 0.2],
+            ),
+            default_n_shown_samples=2000,
+            resampled_trace_prefix_suffix=("", ""),
+            show_mean_aggregation_size=False,
         )
 
+        # Bind the index and shared columns once; to_numpy(copy=False) hands
+        # plotly a view instead of going through the Series on every trace
+        idx = data.index
+        close = data["Close"].to_numpy(copy=False)
+        cols = frozenset(data.columns)
+
         # Price and moving averages
         fig.add_trace(
-            go.Scatter(
-                x=data.index,
-                y=data["Close"],
-                name="Price",
-                line=dict(color=self.colors["primary"]),
-            ),
+            self._scatter(name="Price", line=self._line_styles["primary"]),
+            hf_x=idx,
+            hf_y=close,
             row=1,
             col=1,
         )
 
-        if "SMA_20" in data.columns:
+        if "SMA_20" in cols:
             fig.add_trace(
-                go.Scatter(
-                    x=data.index,
-                    y=data["SMA_20"],
-                    name="SMA 20",
-                    line=dict(color=self.colors["secondary"]),
-                ),
+                self._scatter(name="SMA 20", line=self._line_styles["secondary"]),
+                hf_x=idx,
+                hf_y=data["SMA_20"].to_numpy(copy=False),
                 row=1,
                 col=1,
             )
 
-        if "SMA_50" in data.columns:
+        if "SMA_50" in cols:
             fig.add_trace(
-                go.Scatter(
-                    x=data.index,
-                    y=data["SMA_50"],
-                    name="SMA 50",
-                    line=dict(color=self.colors["warning"]),
-                ),
+                self._scatter(name="SMA 50", line=self._line_styles["warning"]),
+                hf_x=idx,
+                hf_y=data["SMA_50"].to_numpy(copy=False),
                 row=1,
                 col=1,
             )
 
         # Bollinger Bands
-        if all(col in data.columns for col in ["BB_Upper", "BB_Middle", "BB_Lower"]):
+        if {"BB_Upper", "BB_Middle", "BB_Lower"}.issubset(cols):
             fig.add_trace(
-                go.Scatter(
-                    x=data.index,
-                    y=data["BB_Upper"],
+                self._scatter(
                     name="BB Upper",
                     line=dict(color="rgba(255,0,0,0.3)"),
                     showlegend=False,
                 ),
+                hf_x=idx,
+                hf_y=data["BB_Upper"].to_numpy(copy=False),
                 row=1,
                 col=1,
             )
             fig.add_trace(
-                go.Scatter(
-                    x=data.index,
-                    y=data["BB_Lower"],
+                self._scatter(
                     name="BB Lower",
                     line=dict(color="rgba(255,0,0,0.3)"),
                     fill="tonexty",
                 ),
+                hf_x=idx,
+                hf_y=data["BB_Lower"].to_numpy(copy=False),
                 row=1,
                 col=1,
             )
 
         # Volume
-        colors = [
-            "red" if close < open else "green"
-            for close, open in zip(data["Close"], data["Open"])
-        ]
-
+        bar_x, volume, colors = _volume_bars(
+            idx,
+            data["Open"].to_numpy(copy=False),
+            close,
+            data["Volume"].to_numpy(copy=False),
+        )
         fig.add_trace(
-            go.Bar(x=data.index, y=data["Volume"], name="Volume", marker_color=colors),
+            go.Bar(x=bar_x, y=volume, name="Volume", marker_color=colors),
             row=2,
             col=1,
         )
 
         # RSI
-        if "RSI" in data.columns:
+        if "RSI" in cols:
             fig.add_trace(
-                go.Scatter(
-                    x=data.index,
-                    y=data["RSI"],
-                    name="RSI",
-                    line=dict(color=self.colors["info"]),
-                ),
+                self._scatter(name="RSI", line=self._line_styles["info"]),
+                hf_x=idx,
+                hf_y=data["RSI"].to_numpy(copy=False),
                 row=3,
                 col=1,
             )
@@ -142,34 +232,31 @@ class CryptoVisualizer:
             fig.add_hline(y=30, line_dash="dash", line_color="green", row=3, col=1)
 
         # MACD
-        if "MACD" in data.columns and "MACD_Signal" in data.columns:
+        if {"MACD", "MACD_Signal"}.issubset(cols):
             fig.add_trace(
-                go.Scatter(
-                    x=data.index,
-                    y=data["MACD"],
-                    name="MACD",
-                    line=dict(color=self.colors["primary"]),
-                ),
+                self._scatter(name="MACD", line=self._line_styles["primary"]),
+                hf_x=idx,
+                hf_y=data["MACD"].to_numpy(copy=False),
                 row=4,
                 col=1,
             )
             fig.add_trace(
-                go.Scatter(
-                    x=data.index,
-                    y=data["MACD_Signal"],
-                    name="MACD Signal",
-                    line=dict(color=self.colors["secondary"]),
-                ),
+                self._scatter(name="MACD Signal", line=self._line_styles["secondary"]),
+                hf_x=idx,
+                hf_y=data["MACD_Signal"].to_numpy(copy=False),
                 row=4,
                 col=1,
             )
 
             # MACD Histogram
-            colors = ["green" if val >= 0 else "red" for val in data["MACD_Histogram"]]
+            bar_x, histogram = _downsample(
+                idx, data["MACD_Histogram"].to_numpy(copy=False)
+            )
+            colors = UP_DOWN_COLORS[(histogram < 0).astype(np.uint8)]
             fig.add_trace(
                 go.Bar(
-                    x=data.index,
-                    y=data["MACD_Histogram"],
+                    x=bar_x,
+                    y=histogram,
                     name="MACD Histogram",
                     marker_color=colors,
                 ),
@@ -186,38 +273,78 @@ class CryptoVisualizer:
         )
 
         if save_path:
-            fig.write_html(save_path)
+            fig.write_html(
+                save_path, include_plotlyjs="cdn", full_html=True, validate=False
+            )
             logger.info(f"Chart saved to {save_path}")
 
         return fig
 
-    def create_correlation_heatmap(self, data_dict, save_path=None):
+    def _compute_returns_matrix(self, data_dict):
         """
-        Create correlation heatmap for multiple cryptocurrencies
+        Daily returns of each symbol with data over the dates they all share.
+        Returns (symbols, matrix) with one matrix column per symbol
         """
-        # Prepare data for correlation analysis
-        returns_data = {}
+        returns_data = {
+            symbol: data["Close"].pct_change().dropna()
+            for symbol, data in data_dict.items()
+            if data is not None and not data.empty
+        }
+        symbols = list(returns_data)
+        if not symbols:
+            return symbols, np.empty((0, 0))
+
+        common_index = functools.reduce(
+            lambda left, right: left.intersection(right),
+            (returns.index for returns in returns_data.values()),
+        )
+        returns_matrix = np.column_stack(
+            [
+                returns_data[symbol].reindex(common_index).to_numpy()
+                for symbol in symbols
+            ]
+        )
+        return symbols, returns_matrix
+
+    def _compute_cumrets(self, data_dict):
+        """
+        Cumulative return of each symbol with data, keyed by symbol
+        """
+        # The running product of (1 + daily return) telescopes to each close
+        # over the first one
+        cumrets = {}
         for symbol, data in data_dict.items():
             if data is not None and not data.empty:
-                returns_data[symbol] = data["Close"].pct_change().dropna()
+                close = data["Close"].to_numpy(dtype=np.float64)
+                cumrets[symbol] = pd.Series(close / close[0], index=data.index)
+        return cumrets
 
-        if len(returns_data) < 2:
+    def create_correlation_heatmap(self, data_dict, save_path=None, returns=None):
+        """
+        Create correlation heatmap for multiple cryptocurrencies.
+        Pass returns from _compute_returns_matrix to reuse them
+        """
+        # Prepare data for correlation analysis
+        if returns is None:
+            returns = self._compute_returns_matrix(data_dict)
+        symbols, returns_matrix = returns
+
+        if len(symbols) < 2:
             logger.warning("Need at least 2 cryptocurrencies for correlation analysis")
             return None
 
         # Create correlation matrix
-        returns_df = pd.DataFrame(returns_data)
-        correlation_matrix = returns_df.corr()
+        correlation_matrix = np.corrcoef(returns_matrix, rowvar=False)
 
         # Create heatmap
         fig = go.Figure(
             data=go.Heatmap(
-                z=correlation_matrix.values,
-                x=correlation_matrix.columns,
-                y=correlation_matrix.columns,
+                z=correlation_matrix,
+                x=symbols,
+                y=symbols,
                 colorscale="RdBu",
                 zmid=0,
-                text=np.round(correlation_matrix.values, 2),
+                text=np.round(correlation_matrix, 2),
                 texttemplate="%{text}",
                 textfont={"size": 10},
                 hoverongaps=False,
@@ -232,7 +359,7 @@ class CryptoVisualizer:
         )
 
         if save_path:
-            fig.write_html(save_path)
+            save_path = self._save_tile(fig, save_path)
             logger.info(f"Correlation heatmap saved to {save_path}")
 
         return fig
@@ -295,28 +422,25 @@ class CryptoVisualizer:
         fig.add_hline(y=0, line_dash="dash", line_color="gray")
 
         if save_path:
-            fig.write_html(save_path)
+            save_path = self._save_tile(fig, save_path)
             logger.info(f"Risk-return scatter plot saved to {save_path}")
 
         return fig
 
-    def create_performance_comparison(self, data_dict, save_path=None):
+    def create_performance_comparison(self, data_dict, save_path=None, cumrets=None):
         """
-        Create performance comparison chart
+        Create performance comparison chart.
+        Pass cumrets from _compute_cumrets to reuse them
         """
-        if not data_dict:
+        if not data_dict and cumrets is None:
             logger.error("No data provided for performance comparison")
             return None
 
         # Calculate cumulative returns
-        performance_data = {}
-        for symbol, data in data_dict.items():
-            if data is not None and not data.empty:
-                returns = data["Close"].pct_change().dropna()
-                cumulative_returns = (1 + returns).cumprod()
-                performance_data[symbol] = cumulative_returns
+        if cumrets is None:
+            cumrets = self._compute_cumrets(data_dict)
 
-        if len(performance_data) < 2:
+        if len(cumrets) < 2:
             logger.warning(
                 "Need at least 2 cryptocurrencies for performance comparison"
             )
@@ -325,12 +449,13 @@ class CryptoVisualizer:
         # Create comparison chart
         fig = go.Figure()
 
-        colors = px.colors.qualitative.Set3
-        for i, (symbol, performance) in enumerate(performance_data.items()):
+        colors = _palette("Set3")
+        for i, (symbol, performance) in enumerate(cumrets.items()):
+            x, y = _downsample(performance.index, performance.to_numpy(copy=False))
             fig.add_trace(
-                go.Scatter(
-                    x=performance.index,
-                    y=performance.values,
+                self._scatter(
+                    x=x,
+                    y=y,
                     name=symbol,
                     line=dict(color=colors[i % len(colors)]),
                 )
@@ -348,7 +473,7 @@ class CryptoVisualizer:
         fig.add_hline(y=1.0, line_dash="dash", line_color="gray")
 
         if save_path:
-            fig.write_html(save_path)
+            save_path = self._save_tile(fig, save_path)
             logger.info(f"Performance comparison saved to {save_path}")
 
         return fig
@@ -371,40 +496,79 @@ class CryptoVisualizer:
             if result and "risk_metrics" in result:
                 risk_metrics_dict[symbol] = result["risk_metrics"]
 
+        # Returns for the heatmap and performance comparison, computed once
+        # for the symbols that have data
+        returns = self._compute_returns_matrix(data_dict)
+        cumrets = self._compute_cumrets(data_dict)
+
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
 
-        # Generate all charts
+        # Generate all charts; the index is written by a background thread
+        # as each chart is finished
         charts_created = []
-
-        # 1. Individual price charts
-        for symbol, data in data_dict.items():
-            if data is not None:
-                chart_path = os.path.join(output_dir, f"{symbol.lower()}_chart.html")
-                self.create_price_chart(data, symbol, chart_path)
-                charts_created.append(chart_path)
-
-        # 2. Correlation heatmap
-        if len(data_dict) >= 2:
-            corr_path = os.path.join(output_dir, "correlation_heatmap.html")
-            self.create_correlation_heatmap(data_dict, corr_path)
-            charts_created.append(corr_path)
-
-        # 3. Risk-return scatter
-        if risk_metrics_dict:
-            risk_path = os.path.join(output_dir, "risk_return_analysis.html")
-            self.create_risk_return_scatter(risk_metrics_dict, risk_path)
-            charts_created.append(risk_path)
-
-        # 4. Performance comparison
-        if len(data_dict) >= 2:
-            perf_path = os.path.join(output_dir, "performance_comparison.html")
-            self.create_performance_comparison(data_dict, perf_path)
-            charts_created.append(perf_path)
-
-        # Create dashboard index
+        chart_queue = queue.Queue()
         dashboard_path = os.path.join(output_dir, "dashboard_index.html")
-        self.create_dashboard_index(charts_created, dashboard_path)
+        index_writer = threading.Thread(
+            target=self._write_index, args=(chart_queue, dashboard_path)
+        )
+
+        def chart_done(chart_path):
+            charts_created.append(chart_path)
+            chart_queue.put(chart_path)
+
+        # 1. Individual price charts (independent, so built in worker processes)
+        price_charts = {
+            symbol: os.path.join(output_dir, f"{symbol.lower()}_chart.html")
+            for symbol, data in data_dict.items()
+            if data is not None
+        }
+        max_workers = max(1, min(len(price_charts), os.cpu_count() or 1))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    _write_price_chart,
+                    symbol,
+                    data_dict[symbol],
+                    chart_path,
+                    {"use_webgl": self.use_webgl, "mode": self.mode},
+                )
+                for symbol, chart_path in price_charts.items()
+            ]
+            # The workers are forked by the first submit; only start the
+            # writer thread now, as forking a multi-threaded process can
+            # deadlock
+            index_writer.start()
+
+            try:
+                for future in futures:
+                    chart_done(future.result())
+
+                # 2. Correlation heatmap
+                if len(returns[0]) >= 2:
+                    corr_path = os.path.join(output_dir, "correlation_heatmap.html")
+                    self.create_correlation_heatmap(
+                        data_dict, corr_path, returns=returns
+                    )
+                    chart_done(self._tile_path(corr_path))
+
+                # 3. Risk-return scatter
+                if risk_metrics_dict:
+                    risk_path = os.path.join(output_dir, "risk_return_analysis.html")
+                    self.create_risk_return_scatter(risk_metrics_dict, risk_path)
+                    chart_done(self._tile_path(risk_path))
+
+                # 4. Performance comparison
+                if len(cumrets) >= 2:
+                    perf_path = os.path.join(output_dir, "performance_comparison.html")
+                    self.create_performance_comparison(
+                        data_dict, perf_path, cumrets=cumrets
+                    )
+                    chart_done(self._tile_path(perf_path))
+            finally:
+                # Finish the dashboard index
+                chart_queue.put(None)
+                index_writer.join()
 
         logger.info(f"Dashboard created with {len(charts_created)} charts")
         return dashboard_path
@@ -413,7 +577,33 @@ class CryptoVisualizer:
         """
         Create an HTML index page for the dashboard
         """
-        html_content = (
+        parts = [self._index_header()]
+        parts.extend(self._index_section(chart_path) for chart_path in chart_paths)
+        parts.append(self._index_footer())
+
+        with open(output_path, "w") as f:
+            f.write("".join(parts))
+
+        logger.info(f"Dashboard index created at {output_path}")
+
+    def _write_index(self, chart_queue, output_path):
+        """
+        Write the dashboard index as chart paths arrive on chart_queue,
+        finishing when None is received
+        """
+        with open(output_path, "w") as f:
+            f.write(self._index_header())
+            for chart_path in iter(chart_queue.get, None):
+                f.write(self._index_section(chart_path))
+            f.write(self._index_footer())
+
+        logger.info(f"Dashboard index created at {output_path}")
+
+    def _index_header(self):
+        """
+        Opening HTML of the dashboard index, up to the first chart
+        """
+        return (
             """
         <!DOCTYPE html>
         <html>
@@ -425,6 +615,7 @@ class CryptoVisualizer:
                 .chart-section { margin-bottom: 40px; }
                 .chart-title { font-size: 18px; font-weight: bold; margin-bottom: 10px; }
                 iframe { width: 100%; height: 600px; border: none; }
+                img { max-width: 100%; }
             </style>
         </head>
         <body>
@@ -437,29 +628,42 @@ class CryptoVisualizer:
         """
         )
 
-        for chart_path in chart_paths:
-            chart_name = (
-                os.path.basename(chart_path)
-                .replace(".html", "")
-                .replace("_", " ")
-                .title()
-            )
-            html_content += f"""
+    def _index_section(self, chart_path):
+        """
+        Dashboard index section embedding one chart
+        """
+        chart_file = os.path.basename(chart_path)
+        stem, extension = os.path.splitext(chart_file)
+        chart_name = stem.replace("_", " ").title()
+        # Static charts are images; interactive ones are embedded pages
+        if extension == ".png":
+            chart = f'<img src="{chart_file}" alt="{chart_name}">'
+        else:
+            chart = f'<iframe src="{chart_file}"></iframe>'
+        return f"""
             <div class="chart-section">
                 <div class="chart-title">{chart_name}</div>
-                <iframe src="{os.path.basename(chart_path)}"></iframe>
+                {chart}
             </div>
             """
 
-        html_content += """
+    def _index_footer(self):
+        """
+        Closing HTML of the dashboard index
+        """
+        return """
         </body>
         </html>
         """
 
-        with open(output_path, "w") as f:
-            f.write(html_content)
 
-        logger.info(f"Dashboard index created at {output_path}")
+def _write_price_chart(symbol, data, save_path, visualizer_kwargs):
+    """
+    Create and save one price chart; module level so worker processes
+    can run it
+    """
+    CryptoVisualizer(**visualizer_kwargs).create_price_chart(data, symbol, save_path)
+    return save_path
 
 
 def main():
@@ -26,30 +26,32 @@ def create_sample_data():
     dates = pd.date_range(start=start_date, end=end_date, freq="D")
 
     # Create sample data for BTC
-    np.random.seed(42)  # For reproducible results
+    rng = np.random.default_rng(42)  # For reproducible results
     initial_price = 50000
-    returns = np.random.normal(0.001, 0.02, len(dates))  # Daily returns
-    prices = [initial_price]
+    returns = rng.normal(0.001, 0.02, len(dates))  # Daily returns
+    returns[0] = 0.0  # First day is the initial price
+    prices = initial_price * np.cumprod(1 + returns)
 
-    for ret in returns[1:]:
-        prices.append(prices[-1] * (1 + ret))
+    high_noise = np.abs(rng.normal(0, 0.01, len(dates)))
+    low_noise = np.abs(rng.normal(0, 0.01, len(dates)))
+
+    open_ = close = prices
+    # Ensure High >= Low and High >= Close >= Low
+    high = np.maximum.reduce([open_, prices * (1 + high_noise), close])
+    low = np.minimum.reduce([open_, prices * (1 - low_noise), close])
 
     # Create OHLCV data
     data = pd.DataFrame(
         {
-            "Open": prices,
-            "High": [p * (1 + abs(np.random.normal(0, 0.01))) for p in prices],
-            "Low": [p * (1 - abs(np.random.normal(0, 0.01))) for p in prices],
-            "Close": prices,
-            "Volume": np.random.uniform(1000000, 5000000, len(dates)),
+            "Open": open_,
+            "High": high,
+            "Low": low,
+            "Close": close,
+            "Volume": rng.uniform(1000000, 5000000, len(dates)),
         },
         index=dates,
     )
 
-    # Ensure High >= Low and High >= Close >= Low
-    data["High"] = data[["Open", "High", "Close"]].max(axis=1)
-    data["Low"] = data[["Open", "Low", "Close"]].min(axis=1)
-
     return data
 
 
@@ -0,0 +1,37 @@
+"""
+Shared test fixtures
+"""
+
+import numpy as np
+import pytest
+
+from src.analyzer import CryptoAnalyzer
+
+
+@pytest.fixture
+def make_prices():
+    """
+    Factory for random-walk closes and volumes as float32 arrays, with
+    optional NaN gaps (an index or list of indices)
+    """
+
+    def make(n=200, close_gap=None, volume_gap=None):
+        rng = np.random.default_rng(7)
+        close = 50000 * np.cumprod(1 + rng.normal(0.001, 0.02, n))
+        close = close.astype(np.float32)
+        volume = rng.uniform(1e6, 5e6, n).astype(np.float32)
+        if close_gap is not None:
+            close[close_gap] = np.nan
+        if volume_gap is not None:
+            volume[volume_gap] = np.nan
+        return close, volume
+
+    return make
+
+
+@pytest.fixture
+def analyzer():
+    """
+    CryptoAnalyzer for tests that don't fetch data
+    """
+    return CryptoAnalyzer()
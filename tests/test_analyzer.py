@@ -0,0 +1,89 @@
+"""
+Tests for CryptoAnalyzer calculations that don't need network access
+"""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.mark.parametrize("gap", [None, 0, 60])
+def test_max_drawdown_matches_pandas(analyzer, gap):
+    """Max drawdown matches the expanding-peak definition and skips NaN"""
+    rng = np.random.default_rng(3)
+    prices = pd.Series(100 * np.cumprod(1 + rng.normal(0, 0.03, 200)))
+    if gap is not None:
+        prices.iloc[gap] = np.nan
+
+    peak = prices.expanding(min_periods=1).max()
+    expected = ((prices - peak) / peak).min()
+
+    assert analyzer.calculate_max_drawdown(prices) == pytest.approx(expected)
+
+
+def test_flat_prices_give_no_rsi_signal(analyzer):
+    """A stablecoin-like flat series is neither oversold nor overbought"""
+    index = pd.date_range("2024-01-01", periods=80, freq="D")
+    data = pd.DataFrame(
+        {
+            "Open": 1.0,
+            "High": 1.0,
+            "Low": 1.0,
+            "Close": 1.0,
+            "Volume": 1e6,
+        },
+        index=index,
+    )
+
+    signals = analyzer.generate_signals(analyzer.calculate_technical_indicators(data))
+
+    assert (signals["RSI_Signal"] == 0).all()
+
+
+@pytest.mark.parametrize("n", [2, 21, 41, 200])
+def test_var_and_cvar_match_percentile(analyzer, n):
+    """VaR is np.percentile's 5th percentile and CVaR the mean of the tail"""
+    rng = np.random.default_rng(n)
+    returns = rng.normal(0.001, 0.03, n)
+    close = 100 * np.cumprod(np.concatenate([[1.0], 1 + returns]))
+    data = pd.DataFrame({"Close": close})
+
+    metrics = analyzer.calculate_risk_metrics(data)
+
+    returns = np.diff(close) / close[:-1]
+    var_95 = np.percentile(returns, 5)
+    assert metrics["VaR_95"] == pytest.approx(var_95)
+    assert metrics["CVaR_95"] == pytest.approx(returns[returns <= var_95].mean())
+
+
+def test_combined_signals_match_mean_of_fired_signals(analyzer):
+    """
+    Every combination of the four signals combines like the mean over the
+    signals that fired, with a final signal beyond +-0.5
+    """
+    combos = np.array(list(itertools.product([-1, 0, 1], repeat=4)))
+    macd, rsi, ma, bb = combos.T
+    data = pd.DataFrame(
+        {
+            "Close": 0.0,
+            "MACD": macd.astype(float),
+            "MACD_Signal": 0.0,
+            "RSI": np.choose(rsi + 1, [80.0, 50.0, 20.0]),
+            "SMA_20": ma.astype(float),
+            "SMA_50": 0.0,
+            "BB_Lower": np.choose(bb + 1, [-2.0, -1.0, 1.0]),
+            "BB_Upper": np.choose(bb + 1, [-1.0, 1.0, 2.0]),
+        }
+    )
+
+    signals = analyzer.generate_signals(data)
+
+    columns = ["MACD_Signal", "RSI_Signal", "MA_Signal", "BB_Signal"]
+    np.testing.assert_array_equal(signals[columns].to_numpy(), combos)
+    fired = pd.DataFrame(combos).replace(0, np.nan)
+    combined = fired.mean(axis=1)
+    final = np.where(combined > 0.5, 1, np.where(combined < -0.5, -1, 0))
+    np.testing.assert_allclose(signals["Combined_Signal"], combined)
+    np.testing.assert_array_equal(signals["Final_Signal"], final)
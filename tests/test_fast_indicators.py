@@ -0,0 +1,102 @@
+"""
+Tests for the Numba indicator kernels, checked against pandas
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.fast_indicators import compute_all, macd_fused
+
+
+def wilder_rsi(close, period=14):
+    """
+    Reference RSI: Wilder's smoothing seeded with the first `period` changes
+    """
+    delta = close.diff()
+    gain = delta.clip(lower=0)
+    loss = -delta.clip(upper=0)
+
+    def smooth(values):
+        seeded = values.copy()
+        seeded.iloc[:period] = np.nan
+        seeded.iloc[period] = values.iloc[1 : period + 1].mean()
+        return seeded.ewm(alpha=1 / period, adjust=False).mean()
+
+    return 100 - 100 / (1 + smooth(gain) / smooth(loss))
+
+
+@pytest.mark.parametrize(
+    "close_gap, volume_gap", [(None, None), (60, None), (None, 100), (60, 100)]
+)
+def test_rolling_indicators_match_pandas(make_prices, close_gap, volume_gap):
+    """Rolling windows match pandas, including warm-up rows and NaN gaps"""
+    close, volume = make_prices(close_gap=close_gap, volume_gap=volume_gap)
+    sma_20, sma_50, _, bb_std, volume_sma = compute_all(close, volume)
+
+    close_series = pd.Series(close, dtype=np.float64)
+    volume_series = pd.Series(volume, dtype=np.float64)
+    expected = {
+        "SMA_20": (sma_20, close_series.rolling(20).mean()),
+        "SMA_50": (sma_50, close_series.rolling(50).mean()),
+        "BB_Std": (bb_std, close_series.rolling(20).std()),
+        "Volume_SMA": (volume_sma, volume_series.rolling(20).mean()),
+    }
+    for name, (actual, reference) in expected.items():
+        np.testing.assert_allclose(actual, reference, rtol=1e-5, err_msg=name)
+
+
+def test_nan_gap_only_affects_windows_containing_it(make_prices):
+    """A single missing close only blanks the windows that include it"""
+    close, volume = make_prices(close_gap=60)
+    sma_20, sma_50, rsi, bb_std, _ = compute_all(close, volume)
+
+    assert np.isnan(sma_20[60:80]).all()
+    assert np.isfinite(sma_20[80:]).all()
+    assert np.isnan(sma_50[60:110]).all()
+    assert np.isfinite(sma_50[110:]).all()
+    assert np.isfinite(bb_std[80:]).all()
+    assert np.isnan(rsi[60])
+    assert np.isfinite(rsi[61:]).all()
+
+
+@pytest.mark.parametrize("close_gap", [None, 5, 60])
+def test_rsi_matches_wilder_reference(make_prices, close_gap):
+    """RSI follows Wilder's smoothing and steps over missing closes"""
+    close, volume = make_prices(close_gap=close_gap)
+    rsi = compute_all(close, volume)[2]
+
+    close_series = pd.Series(close, dtype=np.float64)
+    expected = wilder_rsi(close_series.dropna()).reindex(close_series.index)
+    np.testing.assert_allclose(rsi, expected, rtol=1e-5)
+
+
+@pytest.mark.parametrize("close_gap", [None, 0, 60, [60, 61, 62]])
+def test_macd_matches_pandas_ewm(make_prices, close_gap):
+    """EMAs and MACD match pandas ewm(), which decays weights over NaN gaps"""
+    close, _ = make_prices(close_gap=close_gap)
+    outputs = [np.empty(close.size, dtype=np.float32) for _ in range(5)]
+    macd_fused(close, 2 / 13, 2 / 27, 2 / 10, *outputs)
+
+    close_series = pd.Series(close, dtype=np.float64)
+    ema_12 = close_series.ewm(span=12).mean()
+    ema_26 = close_series.ewm(span=26).mean()
+    macd = ema_12 - ema_26
+    signal = macd.ewm(span=9).mean()
+    expected = [ema_12, ema_26, macd, signal, macd - signal]
+
+    names = ["EMA_12", "EMA_26", "MACD", "MACD_Signal", "MACD_Histogram"]
+    for name, actual, reference in zip(names, outputs, expected):
+        np.testing.assert_allclose(
+            actual, reference, rtol=1e-6, atol=1e-6, err_msg=name
+        )
+    assert np.isfinite(outputs[2][close_series.first_valid_index() :]).all()
+
+
+def test_rsi_is_neutral_for_flat_prices():
+    """Flat prices give RSI 50 rather than an oversold 0"""
+    close = np.full(60, 1.0, dtype=np.float32)
+    rsi = compute_all(close, close)[2]
+
+    assert np.isnan(rsi[:14]).all()
+    assert (rsi[14:] == 50.0).all()
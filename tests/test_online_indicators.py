@@ -0,0 +1,78 @@
+"""
+Tests that the streaming indicators agree with the batch calculation
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.online_indicators import OnlineEMA, OnlineIndicators
+
+INDICATORS = [
+    "SMA_20",
+    "SMA_50",
+    "EMA_12",
+    "EMA_26",
+    "MACD",
+    "MACD_Signal",
+    "MACD_Histogram",
+    "RSI",
+    "BB_Middle",
+    "BB_Upper",
+    "BB_Lower",
+    "Volume_SMA",
+    "Volume_Ratio",
+]
+
+
+def make_frame(close, volume):
+    index = pd.date_range("2024-01-01", periods=close.size, freq="D")
+    return pd.DataFrame(
+        {"Open": close, "High": close, "Low": close, "Close": close, "Volume": volume},
+        index=index,
+    )
+
+
+@pytest.mark.parametrize(
+    "close_gap, volume_gap", [(None, None), (60, None), (None, 100), (60, 100)]
+)
+def test_online_matches_batch_on_every_bar(
+    analyzer, make_prices, close_gap, volume_gap
+):
+    """Every bar matches the batch indicators, warm-up rows and gaps included"""
+    close, volume = make_prices(close_gap=close_gap, volume_gap=volume_gap)
+    batch = analyzer.calculate_technical_indicators(make_frame(close, volume))
+
+    state = OnlineIndicators()
+    online = pd.DataFrame(
+        [state.update(float(c), float(v)) for c, v in zip(close, volume)],
+        index=batch.index,
+    )
+
+    for name in INDICATORS:
+        np.testing.assert_allclose(
+            online[name], batch[name], rtol=1e-5, atol=1e-6, err_msg=name
+        )
+
+
+def test_update_live_continues_analyzed_history(analyzer, make_prices):
+    """update_live warms up from history and matches the batch last bar"""
+    close, volume = make_prices(close_gap=120)
+    batch = analyzer.calculate_technical_indicators(make_frame(close, volume))
+    analyzer.analysis_results["BTC"] = {"data": batch.iloc[:-1]}
+
+    latest = analyzer.update_live("BTC", close[-1], volume[-1])
+
+    for name in INDICATORS:
+        assert latest[name] == pytest.approx(batch[name].iloc[-1], rel=1e-5), name
+
+
+def test_online_ema_decays_over_missing_values():
+    """OnlineEMA follows pandas ewm() through leading and inner NaN"""
+    values = [np.nan, 1.0, 2.0, np.nan, 4.0, 5.0]
+    ema = OnlineEMA(3)
+
+    online = [ema.update(x) for x in values]
+
+    expected = pd.Series(values).ewm(span=3).mean()
+    np.testing.assert_allclose(online, expected)
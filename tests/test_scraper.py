@@ -0,0 +1,155 @@
+"""
+Tests for CryptoScraper that don't need network access
+"""
+
+import asyncio
+import os
+import time
+
+import pandas as pd
+import pytest
+import requests
+
+from src import scraper as scraper_module
+from src.scraper import CryptoScraper
+
+
+@pytest.fixture
+def scraper(monkeypatch):
+    """
+    Scraper whose Yahoo chart fetch returns a small frame per symbol
+    """
+
+    async def fake_fetch_all(symbols, period):
+        return {symbol: pd.DataFrame({"Close": [1.0, 2.0]}) for symbol in symbols}
+
+    scraper = CryptoScraper(cache_enabled=False)
+    monkeypatch.setattr(scraper, "_fetch_all", fake_fetch_all)
+    return scraper
+
+
+def test_get_crypto_data_many(scraper):
+    """The blocking API fetches every symbol"""
+    results = scraper.get_crypto_data_many(["BTC", "ETH"], "6mo")
+
+    assert list(results) == ["BTC", "ETH"]
+    assert all(len(data) == 2 for data in results.values())
+
+
+def test_get_crypto_data_many_inside_running_loop(scraper):
+    """The blocking API also works from async code, e.g. a Jupyter cell"""
+
+    async def notebook_cell():
+        return scraper.get_crypto_data_many(["BTC"], "6mo")
+
+    results = asyncio.run(notebook_cell())
+
+    assert len(results["BTC"]) == 2
+
+
+def test_fetch_crypto_data_many(scraper):
+    """The async API can be awaited directly"""
+    results = asyncio.run(scraper.fetch_crypto_data_many(["SOL"], "6mo"))
+
+    assert len(results["SOL"]) == 2
+
+
+@pytest.fixture
+def cached_scraper(monkeypatch, tmp_path):
+    """
+    Disk-caching scraper whose Yahoo fetch counts its calls
+    """
+    calls = []
+
+    class FakeTicker:
+        def __init__(self, name):
+            self.name = name
+
+        def history(self, period):
+            calls.append((self.name, period))
+            index = pd.date_range("2024-01-01", periods=3, freq="D")
+            return pd.DataFrame({"Close": [1.0, 2.0, 3.0]}, index=index)
+
+    monkeypatch.setattr(scraper_module.yf, "Ticker", FakeTicker)
+    scraper = CryptoScraper(cache_dir=str(tmp_path), cache_duration=60)
+    scraper.calls = calls
+    return scraper
+
+
+def test_disk_cache_hit(cached_scraper):
+    """A second fetch within cache_duration is read from disk"""
+    first = cached_scraper.get_crypto_data_yahoo("BTC", "6mo")
+    second = cached_scraper.get_crypto_data_yahoo("BTC", "6mo")
+
+    assert cached_scraper.calls == [("BTC-USD", "6mo")]
+    pd.testing.assert_frame_equal(first, second, check_freq=False)
+
+
+def test_disk_cache_expires(cached_scraper):
+    """Entries older than cache_duration are fetched again"""
+    cached_scraper.get_crypto_data_yahoo("BTC", "6mo")
+    path = cached_scraper._cache_path("BTC", "6mo")
+    stale = time.time() - 120
+    os.utime(path, (stale, stale))
+
+    cached_scraper.get_crypto_data_yahoo("BTC", "6mo")
+
+    assert len(cached_scraper.calls) == 2
+
+
+def test_unreadable_disk_cache_is_refetched(cached_scraper):
+    """A corrupt cache file falls back to fetching and is replaced"""
+    os.makedirs(cached_scraper.cache_dir, exist_ok=True)
+    path = cached_scraper._cache_path("BTC", "6mo")
+    with open(path, "wb") as f:
+        f.write(b"not parquet")
+
+    data = cached_scraper.get_crypto_data_yahoo("BTC", "6mo")
+
+    assert len(cached_scraper.calls) == 1
+    assert list(data["Close"]) == [1.0, 2.0, 3.0]
+    pd.testing.assert_frame_equal(pd.read_parquet(path), data, check_freq=False)
+
+
+@pytest.fixture
+def coingecko(monkeypatch):
+    """
+    Scraper whose CoinGecko request fails or succeeds as set in `responses`,
+    with the shared top-cryptocurrencies cache emptied
+    """
+    monkeypatch.setattr(scraper_module, "_top_cryptos_cache", {})
+    scraper = CryptoScraper(cache_duration=60)
+    scraper.responses = []
+
+    class FakeResponse:
+        def __init__(self, ok):
+            self.ok = ok
+            self.content = b'[{"symbol": "btc"}, {"symbol": "xrp"}]'
+
+        def raise_for_status(self):
+            if not self.ok:
+                raise requests.HTTPError("503 Service Unavailable")
+
+    def fake_get(url, params=None):
+        return FakeResponse(scraper.responses.pop(0))
+
+    monkeypatch.setattr(scraper.session, "get", fake_get)
+    return scraper
+
+
+def test_top_cryptocurrencies_cached(coingecko):
+    """A second call within cache_duration doesn't hit CoinGecko"""
+    coingecko.responses = [True]
+
+    assert coingecko.get_top_cryptocurrencies(2) == ["BTC", "XRP"]
+    assert coingecko.get_top_cryptocurrencies(2) == ["BTC", "XRP"]
+    assert coingecko.responses == []
+
+
+def test_top_cryptocurrencies_fallback_not_cached(coingecko):
+    """The fallback list after a failed request isn't served from cache"""
+    coingecko.responses = [False, True]
+
+    assert coingecko.get_top_cryptocurrencies(2) == ["BTC", "ETH", "BNB", "ADA", "SOL"]
+    assert coingecko.get_top_cryptocurrencies(2) == ["BTC", "XRP"]
+    assert coingecko.responses == []